@@ -0,0 +1,58 @@
+"""
+Shared .env loader for the test scripts
+
+The .env file is parsed once and cached until it changes on disk, so every
+script that imports this module reuses the same parsed values.
+"""
+
+import os
+from functools import lru_cache
+
+
+def _parse_dotenv(data):
+    """Parse KEY=VALUE pairs from the raw bytes of a .env file."""
+    # bytes.splitlines splits the whole buffer in C in one call
+    lines = [line.strip() for line in data.splitlines()]
+    # Comment and blank lines are skipped before anything is decoded
+    return {
+        key.strip().decode('utf-8'): value.strip().decode('utf-8', 'replace')
+        for key, sep, value in (
+            line.partition(b'=')
+            for line in lines
+            if line and not line.startswith(b'#')
+        )
+        if sep
+    }
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv(path, mtime_ns):
+    """Read and parse a .env file; mtime_ns keys the cache so edits are picked up."""
+    with open(path, 'rb') as f:
+        return _parse_dotenv(f.read())
+
+
+def load(path='.env'):
+    """Load a .env file into os.environ and return its pairs, or None if the file is missing."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    pairs = _load_dotenv(path, mtime_ns)
+    # Only write keys whose value differs - each os.environ write calls putenv
+    os.environ.update({
+        key: value
+        for key, value in pairs.items()
+        if os.environ.get(key) != value
+    })
+    return pairs
+
+
+def get(key, default=None):
+    """Look up a value from the cached .env, falling back to the process environment."""
+    # load() is cheap after the first call - one stat, then the mtime-keyed cache
+    pairs = load() or {}
+    if key in pairs:
+        return pairs[key]
+    return os.environ.get(key, default)
@@ -0,0 +1,34 @@
+"""
+Migration 002: Add a (business_id, type) index to the transactions table.
+
+The index backs the per-business GROUP BY aggregates used by the
+unified financials dashboard.
+"""
+
+from sqlalchemy import text, inspect
+from app.database.migrations.base import Migration
+
+
+class Migration002AddBusinessIdIndexes(Migration):
+    """Add a (business_id, type) index to the transactions table."""
+    
+    def __init__(self):
+        super().__init__(
+            version="002",
+            description="Add a (business_id, type) index to the transactions table"
+        )
+    
+    def up(self, connection):
+        """Apply migration: Create the business_id index."""
+        inspector = inspect(connection)
+        tables = inspector.get_table_names()
+        
+        if 'transactions' in tables:
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_transactions_business_id_type
+                ON transactions (business_id, type)
+            """))
+    
+    def down(self, connection):
+        """Rollback migration: Drop the business_id index."""
+        connection.execute(text("DROP INDEX IF EXISTS ix_transactions_business_id_type"))
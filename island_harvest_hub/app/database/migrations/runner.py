@@ -145,8 +145,10 @@ class MigrationRunner:
 def get_all_migrations() -> List[Migration]:
     """Get all available migrations in order."""
     from .m001_add_business_id import Migration001AddBusinessId
+    from .m002_add_business_id_indexes import Migration002AddBusinessIdIndexes
     
     return [
         Migration001AddBusinessId(),
+        Migration002AddBusinessIdIndexes(),
     ]
 
@@ -8,16 +8,30 @@ Uses Claude API to provide intelligent business insights and recommendations
 import os
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 import requests
 
+# Messages _make_api_call and _stream_api_call return in place of an answer when the call fails
+ERROR_PREFIXES = (
+    "⚠️ API key not configured",
+    "⏱️ Request timed out",
+    "❌ Error connecting to AI service",
+    "❌ Error from AI service",
+    "❌ Unexpected error",
+)
+
+
+def is_error_response(text: str) -> bool:
+    """Check whether an API call returned one of the service's error messages"""
+    return text.startswith(ERROR_PREFIXES)
+
 
 class AIAdvisorService:
     """Service for AI-powered business insights using Claude API"""
     
-    def __init__(self):
-        # Try to get API key from environment first
-        self.api_key = os.environ.get('ANTHROPIC_API_KEY', '')
+    def __init__(self, api_key: Optional[str] = None):
+        # Use a key the caller already has, otherwise try the environment first
+        self.api_key = api_key if api_key is not None else os.environ.get('ANTHROPIC_API_KEY', '')
         
         # If not in environment, try Streamlit secrets (for Streamlit Cloud)
         if not self.api_key:
@@ -45,11 +59,8 @@ class AIAdvisorService:
         self.api_url = "https://api.anthropic.com/v1/messages"
         self.model = "claude-sonnet-4-20250514"
         
-    def _make_api_call(self, prompt: str, system_context: str = "") -> str:
-        """Make a call to Claude API"""
-        
-        if not self.api_key:
-            return "⚠️ API key not configured. Please set ANTHROPIC_API_KEY environment variable."
+    def _build_request(self, prompt: str, system_context: str, max_tokens: int) -> tuple:
+        """Build headers and payload for a Claude API request"""
         
         headers = {
             "x-api-key": self.api_key,
@@ -66,13 +77,23 @@ class AIAdvisorService:
         
         data = {
             "model": self.model,
-            "max_tokens": 2000,
+            "max_tokens": max_tokens,
             "messages": messages
         }
         
         if system_context:
             data["system"] = system_context
         
+        return headers, data
+    
+    def _make_api_call(self, prompt: str, system_context: str = "", max_tokens: int = 2000) -> str:
+        """Make a call to Claude API"""
+        
+        if not self.api_key:
+            return "⚠️ API key not configured. Please set ANTHROPIC_API_KEY environment variable."
+        
+        headers, data = self._build_request(prompt, system_context, max_tokens)
+        
         try:
             response = requests.post(self.api_url, headers=headers, json=data, timeout=30)
             response.raise_for_status()
@@ -87,8 +108,42 @@ class AIAdvisorService:
         except Exception as e:
             return f"❌ Unexpected error: {str(e)}"
     
-    def get_business_insights(self, business_data: Dict[str, Any], question: str) -> str:
-        """Get AI insights about the business"""
+    def _stream_api_call(self, prompt: str, system_context: str = "", max_tokens: int = 2000) -> Iterator[str]:
+        """Make a streaming call to Claude API, yielding text chunks as they arrive"""
+        
+        if not self.api_key:
+            yield "⚠️ API key not configured. Please set ANTHROPIC_API_KEY environment variable."
+            return
+        
+        headers, data = self._build_request(prompt, system_context, max_tokens)
+        data["stream"] = True
+        
+        try:
+            with requests.post(self.api_url, headers=headers, json=data, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                # Server-sent events don't declare a charset, so requests would guess latin-1
+                response.encoding = "utf-8"
+                
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    
+                    event = json.loads(line[len("data:"):])
+                    if event.get("type") == "content_block_delta" and event["delta"].get("type") == "text_delta":
+                        yield event["delta"]["text"]
+                    elif event.get("type") == "error":
+                        yield f"❌ Error from AI service: {event['error'].get('message', '')}"
+                        return
+            
+        except requests.exceptions.Timeout:
+            yield "⏱️ Request timed out. Please try again."
+        except requests.exceptions.RequestException as e:
+            yield f"❌ Error connecting to AI service: {str(e)}"
+        except Exception as e:
+            yield f"❌ Unexpected error: {str(e)}"
+    
+    def _business_insights_prompt(self, business_data: Dict[str, Any], question: str) -> tuple:
+        """Build the system context and prompt for a business question"""
         
         system_context = f"""You are an expert business advisor for Bornfidis businesses, 
 a portfolio of companies owned by Brian Miller including farm-to-table distribution, 
@@ -119,8 +174,20 @@ Question: {question}
 
 Please provide a clear, actionable answer with specific recommendations where appropriate."""
 
+        return system_context, prompt
+    
+    def get_business_insights(self, business_data: Dict[str, Any], question: str) -> str:
+        """Get AI insights about the business"""
+        
+        system_context, prompt = self._business_insights_prompt(business_data, question)
         return self._make_api_call(prompt, system_context)
     
+    def stream_insights(self, business_data: Dict[str, Any], question: str) -> Iterator[str]:
+        """Stream AI insights about the business as they are generated"""
+        
+        system_context, prompt = self._business_insights_prompt(business_data, question)
+        return self._stream_api_call(prompt, system_context)
+    
     def get_daily_priorities(self, business_data: Dict[str, Any], business_name: str) -> str:
         """Get AI-powered daily priorities"""
         
@@ -191,6 +258,52 @@ Identify:
 
         return self._make_api_call(prompt, system_context)
     
+    def get_combined_insights(self, business_data: Dict[str, Any], business_name: str) -> Dict[str, str]:
+        """Get daily priorities, revenue forecast and customer trends in one API call"""
+        
+        system_context = """You are a business operations advisor, financial analyst and 
+customer success analyst in one. Answer only with a valid JSON object, no other text."""
+        
+        data_summary = json.dumps(business_data, indent=2)
+        
+        prompt = f"""Based on this business data for {business_name}:
+
+
+
+{data_summary}
+
+
+
+Return a JSON object with exactly these keys, each value a markdown string:
+
+- "priorities": the top 3-5 priorities to focus on today, as a numbered list with clear action items
+
+- "revenue_forecast": revenue prediction for next month with best-case, likely, and worst-case scenarios and your reasoning
+
+- "customer_trends": key satisfaction trends, customers at risk, opportunities for growth and specific action items"""
+
+        response = self._make_api_call(prompt, system_context, max_tokens=4000)
+        
+        # Claude sometimes wraps JSON in a markdown code fence
+        text = response.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+        
+        try:
+            insights = json.loads(text)
+        except ValueError:
+            insights = None
+        
+        if not isinstance(insights, dict):
+            # Not a JSON object - most likely an error message from _make_api_call
+            return {"error": response}
+        
+        return {
+            "priorities": str(insights.get("priorities", "")),
+            "revenue_forecast": str(insights.get("revenue_forecast", "")),
+            "customer_trends": str(insights.get("customer_trends", ""))
+        }
+    
     def compare_businesses(self, business_comparison: Dict[str, Any]) -> str:
         """Compare performance across businesses"""
         
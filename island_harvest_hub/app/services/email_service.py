@@ -18,7 +18,7 @@ class EmailService:
         with open(path, "r") as f:
             return json.load(f)
 
-    def send_email(self, subject, body, to_email=None):
+    def send_email(self, subject, body, to_email=None, dry_run=False):
         if not self.config or not self.config.get("enable_notifications"):
             return False, "Notifications disabled."
 
@@ -39,6 +39,11 @@ class EmailService:
         msg["Subject"] = subject
         msg.attach(MIMEText(body, "plain"))
 
+        # Dry run: config and message are built and serialized, but no SMTP connection is opened
+        if dry_run:
+            msg.as_string()
+            return True, "Dry run: email built but not sent."
+
         try:
             if use_ssl:
                 context = ssl.create_default_context()
@@ -63,8 +68,9 @@ class EmailService:
             return False, f"Email failed: {str(e)}"
 
 
-    def send_test_email(self):
+    def send_test_email(self, dry_run=False):
         return self.send_email(
             subject="Island Harvest Engine — SMTP Test",
-            body="This is a test email from the Bornfidis Island Harvest Engine."
+            body="This is a test email from the Bornfidis Island Harvest Engine.",
+            dry_run=dry_run
         )
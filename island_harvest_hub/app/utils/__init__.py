@@ -3,6 +3,7 @@ Utility modules for Island Harvest Hub.
 """
 
 from .auth import check_password, login, logout, show_logout_button, require_auth
+from .session import session_service
 
-__all__ = ['check_password', 'login', 'logout', 'show_logout_button', 'require_auth']
+__all__ = ['check_password', 'login', 'logout', 'show_logout_button', 'require_auth', 'session_service']
 
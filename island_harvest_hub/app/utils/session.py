@@ -0,0 +1,34 @@
+"""
+Per-browser-session service storage for Island Harvest Hub pages.
+"""
+
+from contextlib import contextmanager
+
+import streamlit as st
+
+
+@contextmanager
+def session_service(key, factory):
+    """
+    Use a service (or tuple of services) kept for the current browser session.
+    
+    Services hold a SQLAlchemy session, which can't be shared between Streamlit's
+    script threads, so they live in session_state rather than st.cache_resource.
+    The session keeps a pooled connection checked out until it is closed, so on
+    exit each session is closed - that returns the connection to the pool and
+    clears the identity map, so the next use reads fresh rows. Don't keep ORM
+    objects from inside the block; they are detached once it ends.
+    
+    Args:
+        key: session_state key to store the service under
+        factory: Callable that creates the service(s) on first use
+    """
+    if key not in st.session_state:
+        st.session_state[key] = factory()
+    services = st.session_state[key]
+    
+    try:
+        yield services
+    finally:
+        for service in services if isinstance(services, tuple) else (services,):
+            service.db.close()
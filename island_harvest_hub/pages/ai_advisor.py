@@ -8,19 +8,25 @@ Provides AI-powered business insights and recommendations
 import streamlit as st
 import os
 import sys
+import json
+import mmap
+import re
 from datetime import datetime
-from app.services.ai_advisor_service import AIAdvisorService
+from app.services.ai_advisor_service import AIAdvisorService, is_error_response
 from app.services.customer_service import CustomerService
 from app.services.financial_service import FinancialService
 from app.services.operations_service import OperationsService
 from app.config.business_profiles import get_business_profile
 from app.utils.auth import check_password, login
+from app.utils.session import session_service
 
 # Require authentication
 if not check_password():
     login()
     st.stop()
 
+_API_KEY_LINE = re.compile(rb'(?m)^[ \t]*ANTHROPIC_API_KEY[ \t]*=([^\r\n]*)')
+
 # Load API key from Streamlit secrets (for Streamlit Cloud) or .env file (for local)
 if not os.environ.get('ANTHROPIC_API_KEY'):
     # First, try to get from Streamlit secrets (for Streamlit Cloud)
@@ -50,58 +56,132 @@ if not os.environ.get('ANTHROPIC_API_KEY'):
         for env_path in possible_paths:
             if os.path.exists(env_path):
                 try:
-                    with open(env_path, 'r') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and not line.startswith('#') and '=' in line:
-                                key, value = line.split('=', 1)
-                                if key.strip() == 'ANTHROPIC_API_KEY':
-                                    os.environ[key.strip()] = value.strip()
-                                    break
+                    # Scan the raw bytes with one regex instead of decoding and splitting every line
+                    with open(env_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        match = _API_KEY_LINE.search(mm)
+                        api_key = match.group(1).decode().strip() if match else None
                 except Exception:
                     continue
-                break
+                if api_key is not None:
+                    os.environ['ANTHROPIC_API_KEY'] = api_key
+                    break
+
+
+@st.cache_resource
+def _ai() -> AIAdvisorService:
+    """Shared AI advisor service (stateless apart from the API key)"""
+    return AIAdvisorService()
 
 
 def get_business_context_data(business_id: str) -> dict:
     """Gather business context data for AI analysis"""
     
-    customer_service = CustomerService()
-    financial_service = FinancialService()
-    operations_service = OperationsService()
-    
-    # Get key metrics
-    customers = customer_service.get_all_customers()
-    transactions = financial_service.get_all_transactions()
-    daily_logs = operations_service.get_all_daily_logs()
-    
-    # Calculate summaries
-    # Revenue transactions: "Revenue" or "Payment Received"
-    # Expense transactions: "Expense" or "Farmer Payment" (stored as negative amounts)
-    total_revenue = sum(t.amount for t in transactions if t.type in ["Revenue", "Payment Received"])
-    total_expenses = sum(abs(t.amount) for t in transactions if t.type in ["Expense", "Farmer Payment"])
-    customer_count = len(customers)
-    avg_satisfaction = sum(c.satisfaction_score or 0 for c in customers) / max(customer_count, 1)
-    
-    return {
-        "business_id": business_id,
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "customers": {
-            "total": customer_count,
-            "avg_satisfaction": round(avg_satisfaction, 2),
-            "list": [{"name": c.name, "satisfaction": c.satisfaction_score} for c in customers[:5]]
-        },
-        "financials": {
-            "total_revenue": total_revenue,
-            "total_expenses": total_expenses,
-            "net_profit": total_revenue - total_expenses,
-            "profit_margin": round((total_revenue - total_expenses) / max(total_revenue, 1) * 100, 2)
-        },
-        "operations": {
-            "daily_logs_count": len(daily_logs),
-            "recent_activities": [{"date": str(log.log_date), "activities": log.activities} for log in daily_logs[:3]]
+    # Leaving the block closes the services' sessions and returns their connections
+    with session_service(
+        'ai_advisor_services',
+        lambda: (CustomerService(), FinancialService(), OperationsService())
+    ) as (customer_service, financial_service, operations_service):
+        # Get key metrics
+        customers = customer_service.get_all_customers()
+        transactions = financial_service.get_all_transactions()
+        daily_logs = operations_service.get_all_daily_logs()
+        
+        # Calculate summaries
+        # Revenue transactions: "Revenue" or "Payment Received"
+        # Expense transactions: "Expense" or "Farmer Payment" (stored as negative amounts)
+        total_revenue = sum(t.amount for t in transactions if t.type in ["Revenue", "Payment Received"])
+        total_expenses = sum(abs(t.amount) for t in transactions if t.type in ["Expense", "Farmer Payment"])
+        customer_count = len(customers)
+        avg_satisfaction = sum(c.satisfaction_score or 0 for c in customers) / max(customer_count, 1)
+        
+        return {
+            "business_id": business_id,
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "customers": {
+                "total": customer_count,
+                "avg_satisfaction": round(avg_satisfaction, 2),
+                "list": [{"name": c.name, "satisfaction": c.satisfaction_score} for c in customers[:5]]
+            },
+            "financials": {
+                "total_revenue": total_revenue,
+                "total_expenses": total_expenses,
+                "net_profit": total_revenue - total_expenses,
+                "profit_margin": round((total_revenue - total_expenses) / max(total_revenue, 1) * 100, 2)
+            },
+            "operations": {
+                "daily_logs_count": len(daily_logs),
+                "recent_activities": [{"date": str(log.log_date), "activities": log.activities} for log in daily_logs[:3]]
+            }
         }
-    }
+
+
+class AIResponseError(Exception):
+    """Raised when the AI service answers with an error message instead of insights"""
+
+
+def _raise_on_error(response: str) -> str:
+    """Return the response, raising AIResponseError if it is an error message"""
+    if is_error_response(response):
+        raise AIResponseError(response)
+    return response
+
+
+# Cached AI calls - keyed on the JSON-serialized business data so repeat clicks
+# with unchanged data don't hit the Anthropic API again. Errors are raised rather
+# than returned so st.cache_data never stores a transient failure
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_priorities(data_json: str, business_name: str) -> str:
+    return _raise_on_error(_ai().get_daily_priorities(json.loads(data_json), business_name))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_revenue_prediction(data_json: str, business_name: str) -> str:
+    return _raise_on_error(_ai().predict_revenue(json.loads(data_json), business_name))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_customer_trends(customers_json: str) -> str:
+    return _raise_on_error(_ai().analyze_customer_trends(json.loads(customers_json)))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_combined_insights(data_json: str, business_name: str) -> dict:
+    insights = _ai().get_combined_insights(json.loads(data_json), business_name)
+    if 'error' in insights:
+        raise AIResponseError(insights['error'])
+    return insights
+
+
+def _track_last_chunk(stream, state: dict):
+    """Pass a text stream through, remembering its last chunk in state['last']"""
+    for chunk in stream:
+        state['last'] = chunk
+        yield chunk
+
+
+# data_json changes with the date and live data, so only the latest rendering is kept
+@st.cache_data(max_entries=1, show_spinner=False)
+def _pretty_business_data(data_json: str) -> str:
+    return json.dumps(json.loads(data_json), indent=2, default=str)
+
+
+def clear_ai_cache():
+    """Drop all cached AI responses so the next request goes to the API"""
+    _cached_priorities.clear()
+    _cached_revenue_prediction.clear()
+    _cached_customer_trends.clear()
+    _cached_combined_insights.clear()
+    st.session_state.ai_answer_cache = {}
+
+
+def format_combined_insights(insights: dict) -> str:
+    """Render the combined insights dict as a single markdown response"""
+
+    return (
+        f"#### 📋 Daily Priorities\n\n{insights['priorities']}\n\n"
+        f"#### 💰 Revenue Prediction\n\n{insights['revenue_forecast']}\n\n"
+        f"#### 👥 Customer Trends\n\n{insights['customer_trends']}"
+    )
 
 
 def show_ai_advisor():
@@ -118,7 +198,7 @@ def show_ai_advisor():
     st.info(f"**Current Business:** {current_business['display_name']}")
     
     # Initialize AI service
-    ai_advisor = AIAdvisorService()
+    ai_advisor = _ai()
     
     # Check API key
     if not ai_advisor.api_key:
@@ -176,26 +256,47 @@ def show_ai_advisor():
     # Quick Actions
     st.markdown("### ⚡ Quick Insights")
     
+    if st.toggle("🔄 Force refresh", help="Ignore cached answers and ask the AI again"):
+        clear_ai_cache()
+    
+    data_json = json.dumps(business_data, sort_keys=True, default=str)
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         if st.button("📋 Daily Priorities", use_container_width=True):
             with st.spinner("Analyzing your business..."):
-                priorities = ai_advisor.get_daily_priorities(business_data, current_business['name'])
-                st.session_state.ai_response = priorities
+                try:
+                    st.session_state.ai_response = _cached_priorities(data_json, current_business['name'])
+                except AIResponseError as e:
+                    st.session_state.ai_response = str(e)
     
     with col2:
         if st.button("💰 Revenue Prediction", use_container_width=True):
             with st.spinner("Forecasting revenue..."):
-                prediction = ai_advisor.predict_revenue(business_data, current_business['name'])
-                st.session_state.ai_response = prediction
+                try:
+                    st.session_state.ai_response = _cached_revenue_prediction(data_json, current_business['name'])
+                except AIResponseError as e:
+                    st.session_state.ai_response = str(e)
     
     with col3:
         if st.button("👥 Customer Trends", use_container_width=True):
             with st.spinner("Analyzing customers..."):
-                trends = ai_advisor.analyze_customer_trends(business_data['customers'])
-                st.session_state.ai_response = trends
-    
+                customers_json = json.dumps(business_data['customers'], sort_keys=True, default=str)
+                try:
+                    st.session_state.ai_response = _cached_customer_trends(customers_json)
+                except AIResponseError as e:
+                    st.session_state.ai_response = str(e)
+
+    if st.button("⚡ Run All", use_container_width=True,
+                 help="Get all three insights in a single AI request - faster and cheaper than clicking each one"):
+        with st.spinner("Running all insights..."):
+            try:
+                insights = _cached_combined_insights(data_json, current_business['name'])
+                st.session_state.ai_response = format_combined_insights(insights)
+            except AIResponseError as e:
+                st.session_state.ai_response = str(e)
+
     st.markdown("---")
     
     # Custom Question
@@ -207,16 +308,35 @@ def show_ai_advisor():
         height=100
     )
     
-    if st.button("🚀 Get Answer", type="primary", use_container_width=True):
-        if question:
-            with st.spinner("Thinking..."):
-                answer = ai_advisor.get_business_insights(business_data, question)
-                st.session_state.ai_response = answer
-        else:
-            st.warning("Please enter a question first.")
+    ask_question = st.button("🚀 Get Answer", type="primary", use_container_width=True)
+    if ask_question and not question:
+        st.warning("Please enter a question first.")
     
     # Display Response
-    if 'ai_response' in st.session_state and st.session_state.ai_response:
+    if ask_question and question:
+        st.markdown("---")
+        st.markdown("### 🎯 AI Insights")
+        # Streamed answers can't go through st.cache_data, so remember them per session
+        answer_cache = st.session_state.setdefault('ai_answer_cache', {})
+        cache_key = (data_json, question)
+        if cache_key in answer_cache:
+            st.session_state.ai_response = answer_cache[cache_key]
+            st.markdown(st.session_state.ai_response)
+        else:
+            # Stream the answer as it is generated instead of waiting for the full response
+            stream_state = {}
+            st.session_state.ai_response = st.write_stream(
+                _track_last_chunk(ai_advisor.stream_insights(business_data, question), stream_state)
+            )
+            # The service reports failures as the final chunk - don't remember those answers
+            if not is_error_response(stream_state.get('last', '')):
+                answer_cache[cache_key] = st.session_state.ai_response
+        
+        # Clear button
+        if st.button("Clear Response"):
+            st.session_state.ai_response = ""
+            st.rerun()
+    elif 'ai_response' in st.session_state and st.session_state.ai_response:
         st.markdown("---")
         st.markdown("### 🎯 AI Insights")
         st.markdown(st.session_state.ai_response)
@@ -228,7 +348,7 @@ def show_ai_advisor():
     
     # Business Context Display
     with st.expander("📊 Current Business Data (What AI Sees)"):
-        st.json(business_data)
+        st.code(_pretty_business_data(data_json), language='json')
 
 
 if __name__ == "__main__":
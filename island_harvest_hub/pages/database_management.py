@@ -5,15 +5,21 @@ Database Management Interface for Island Harvest Hub.
 import streamlit as st
 import os
 import json
+import math
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 import sqlite3
 import time
 import threading
-from queue import Queue
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path to import db_manager
 import sys
@@ -27,16 +33,64 @@ if not check_password():
 from db_manager import DatabaseManager
 
 # Global variables for real-time monitoring
-performance_metrics = Queue()
+# Memory usage history is kept in a fixed-size ring buffer (20 minutes at one sample every 5 seconds)
+HISTORY_SIZE = 240
+memory_history = np.zeros(HISTORY_SIZE, dtype=[('ts', 'datetime64[ms]'), ('mem', 'i8')])
+memory_history_index = 0
 monitoring_active = False
 
+# Per-table SQL strings with quoted identifiers, built once per table name
+_TABLE_SQL = {}
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
 def format_size(size_bytes):
     """Format size in bytes to human readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} GB"
+    # Each unit is 2**10 times the previous one, so the unit index is log2(size) // 10
+    idx = min(int(math.log2(max(size_bytes, 1))) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (idx * 10)):.2f} {SIZE_UNITS[idx]}"
+
+@st.cache_data(show_spinner=False)
+def _table_sizes_fig(sizes_tuple):
+    """Build the table sizes bar chart (cached on the table/row-count pairs)."""
+    table_sizes = pd.DataFrame(sizes_tuple, columns=['Table', 'Rows']).astype(
+        {'Table': 'category', 'Rows': 'int32'}
+    )
+    return px.bar(table_sizes, x='Table', y='Rows',
+                  title='Table Sizes')
+
+# The history changes with every monitor sample, so only the latest figure is kept
+@st.cache_data(max_entries=1, show_spinner=False)
+def _memory_usage_fig(history):
+    """Build the real-time memory chart (cached on the memory history samples)."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=history['ts'],
+        y=history['mem'],
+        mode='lines+markers',
+        name='Memory Usage'
+    ))
+    
+    fig.update_layout(
+        title='Memory Usage Over Time',
+        xaxis_title='Time',
+        yaxis_title='Memory Usage (bytes)'
+    )
+    return fig
+
+@st.cache_resource
+def _db_mgr():
+    """Shared database manager instance (kept across reruns, cleared when email settings change)."""
+    return DatabaseManager()
+
+# Every "Refresh Stats" rewrites the report with a new mtime, so only the latest parse is kept
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_stats(path, mtime):
+    """Parse a stats report (cached until the file's mtime changes)."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def load_stats_report():
     """Load the latest stats report."""
@@ -44,13 +98,27 @@ def load_stats_report():
     if not reports_dir.exists():
         return None
     
-    stats_files = list(reports_dir.glob("stats_*.json"))
+    with os.scandir(reports_dir) as it:
+        stats_files = [
+            entry for entry in it
+            if entry.name.startswith("stats_") and entry.name.endswith(".json")
+        ]
     if not stats_files:
         return None
     
-    latest_stats = max(stats_files, key=lambda x: x.stat().st_mtime)
-    with open(latest_stats, 'r') as f:
-        return json.load(f)
+    latest_stats = max(stats_files, key=lambda entry: entry.stat().st_mtime)
+    return _load_stats(latest_stats.path, latest_stats.stat().st_mtime)
+
+def _table_sql(table_name):
+    """Return the (row count, table info) statements for a table, built once per name."""
+    sql = _TABLE_SQL.get(table_name)
+    if sql is None:
+        quoted = '"' + table_name.replace('"', '""') + '"'
+        sql = _TABLE_SQL[table_name] = (
+            f"SELECT COUNT(*) FROM {quoted}",
+            f"PRAGMA table_info({quoted})"
+        )
+    return sql
 
 def get_detailed_performance_metrics():
     """Get detailed performance metrics from SQLite."""
@@ -87,11 +155,12 @@ def get_detailed_performance_metrics():
             if table and len(table) > 0:
                 table_name = table[0]
                 try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                    count_sql, table_info_sql = _table_sql(table_name)
+                    cursor.execute(count_sql)
                     row_result = cursor.fetchone()
                     row_count = row_result[0] if row_result else 0
                     
-                    cursor.execute(f"PRAGMA table_info({table_name})")
+                    cursor.execute(table_info_sql)
                     columns = cursor.fetchall()
                     column_count = len(columns) if columns else 0
                     
@@ -128,16 +197,25 @@ def get_detailed_performance_metrics():
 
 def monitor_performance():
     """Background thread for real-time performance monitoring."""
-    global monitoring_active
+    global monitoring_active, memory_history_index
     while monitoring_active:
         metrics = get_detailed_performance_metrics()
         if metrics:
-            performance_metrics.put({
-                'timestamp': datetime.now(),
-                'metrics': metrics
-            })
+            memory_history[memory_history_index % HISTORY_SIZE] = (
+                np.datetime64(datetime.now(), 'ms'),
+                metrics.get('memory_usage', 0)
+            )
+            memory_history_index += 1
         time.sleep(5)  # Update every 5 seconds
 
+def get_memory_history():
+    """Return the recorded memory usage samples in chronological order."""
+    count = memory_history_index
+    if count <= HISTORY_SIZE:
+        return memory_history[:count].copy()
+    # Buffer has wrapped - the oldest sample sits at the write position
+    return np.roll(memory_history, -(count % HISTORY_SIZE))
+
 def start_monitoring():
     """Start performance monitoring in background thread."""
     global monitoring_active
@@ -168,7 +246,7 @@ def main():
     st.title("🗄️ Database Management")
     
     # Initialize database manager
-    db_manager = DatabaseManager()
+    db_manager = _db_mgr()
     
     # Sidebar for actions
     st.sidebar.title("Actions")
@@ -214,10 +292,7 @@ def main():
             
             # Table sizes chart (if available)
             if stats.get('table_sizes'):
-                table_sizes = pd.DataFrame(stats['table_sizes'].items(), 
-                                         columns=['Table', 'Rows'])
-                fig = px.bar(table_sizes, x='Table', y='Rows',
-                            title='Table Sizes')
+                fig = _table_sizes_fig(tuple(sorted(stats['table_sizes'].items())))
                 st.plotly_chart(fig)
         else:
             st.info("Click 'Refresh Stats' to see performance metrics")
@@ -228,18 +303,25 @@ def main():
         # List backups
         backups_dir = Path("database_backups")
         if backups_dir.exists():
-            backups = list(backups_dir.glob("backup_*.db"))
+            # DirEntry caches its stat() result, so sorting and display share one syscall per backup
+            with os.scandir(backups_dir) as it:
+                backups = [
+                    entry for entry in it
+                    if entry.name.startswith("backup_") and entry.name.endswith(".db")
+                ]
+            backups.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
             if backups:
-                for backup in sorted(backups, key=lambda x: x.stat().st_mtime, reverse=True):
+                for backup in backups:
+                    backup_stat = backup.stat()
                     with st.expander(f"📦 {backup.name}"):
-                        st.write(f"Size: {format_size(backup.stat().st_size)}")
-                        st.write(f"Created: {datetime.fromtimestamp(backup.stat().st_mtime).strftime('%Y-%m-%d %H:%M:%S')}")
+                        st.write(f"Size: {format_size(backup_stat.st_size)}")
+                        st.write(f"Created: {datetime.fromtimestamp(backup_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')}")
                         
                         col1, col2 = st.columns(2)
                         with col1:
                             if st.button("🔍 Verify", key=f"verify_{backup.name}"):
                                 with st.spinner("Verifying backup..."):
-                                    if db_manager.verify_backup(str(backup)):
+                                    if db_manager.verify_backup(backup.path):
                                         st.success("Backup verified successfully")
                                     else:
                                         st.error("Backup verification failed")
@@ -247,7 +329,7 @@ def main():
                         with col2:
                             if st.button("🗑️ Delete", key=f"delete_{backup.name}"):
                                 try:
-                                    backup.unlink()
+                                    os.remove(backup.path)
                                     st.success("Backup deleted")
                                     st.rerun()
                                 except Exception as e:
@@ -287,7 +369,9 @@ def main():
                     })
                 
                 if table_data:
-                    df = pd.DataFrame(table_data)
+                    df = pd.DataFrame(table_data).astype(
+                        {'Table': 'category', 'Rows': 'int32', 'Columns': 'int16'}
+                    )
                     st.dataframe(df)
             
             with col3:
@@ -295,35 +379,9 @@ def main():
                 if monitoring_enabled:
                     st.write("Real-time Memory Usage")
                     
-                    # Get recent metrics from queue
-                    recent_metrics = []
-                    while not performance_metrics.empty():
-                        recent_metrics.append(performance_metrics.get())
-                    
-                    if recent_metrics:
-                        df = pd.DataFrame([
-                            {
-                                'timestamp': m['timestamp'],
-                                'memory_usage': m['metrics'].get('memory_usage', 0)
-                            }
-                            for m in recent_metrics
-                        ])
-                        
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=df['timestamp'],
-                            y=df['memory_usage'],
-                            mode='lines+markers',
-                            name='Memory Usage'
-                        ))
-                        
-                        fig.update_layout(
-                            title='Memory Usage Over Time',
-                            xaxis_title='Time',
-                            yaxis_title='Memory Usage (bytes)'
-                        )
-                        
-                        st.plotly_chart(fig)
+                    history = get_memory_history()
+                    if len(history):
+                        st.plotly_chart(_memory_usage_fig(history))
         else:
             st.info("Click 'Refresh Stats' to see performance metrics")
     except Exception as e:
@@ -369,6 +427,9 @@ def main():
                     with open(config_path, 'w') as f:
                         json.dump(email_config, f, indent=4)
                     
+                    # The cached manager's EmailNotifier read the old settings - rebuild it on next use
+                    _db_mgr.clear()
+                    
                     st.success("Email settings updated")
     else:
         st.warning("Email configuration file not found")
@@ -6,17 +6,79 @@ Shows financial overview across all Bornfidis businesses
 """
 
 import streamlit as st
+import numpy as np
+import pandas as pd
+from datetime import date
+from operator import itemgetter
 import plotly.graph_objects as go
-import plotly.express as px
 from app.services.unified_financial_service import UnifiedFinancialService
 from app.config.business_profiles import get_all_active_businesses, get_business_profile
 from app.utils.auth import check_password, login
+from app.utils.session import session_service
 
 # Require authentication
 if not check_password():
     login()
     st.stop()
 
+# Shared display formatters for currency and percentage values
+_money = '${:,.2f}'.format
+_pct = '{:.1f}%'.format
+
+# Quick action buttons (label, hint shown when clicked)
+_QUICK_ACTIONS = (
+    ("📊 View Detailed Reports", "Navigate to Financial Management for detailed reports"),
+    ("🎯 Set Revenue Goals", "Navigate to Strategic Planning to set goals"),
+    ("💼 Compare Businesses", "See comparison table above"),
+)
+
+
+def _get_service():
+    """UnifiedFinancialService for the current browser session, closed when the block exits"""
+    return session_service('unified_financial_service', UnifiedFinancialService)
+
+
+# Cached financial data - each helper hits the database, so results are kept
+# for a few minutes instead of being recomputed on every widget interaction
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_summary():
+    with _get_service() as service:
+        return service.get_financial_summary()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_revenue_by_business():
+    with _get_service() as service:
+        return service.get_revenue_by_business()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_comparison():
+    with _get_service() as service:
+        return service.get_business_comparison_data()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_trend(months):
+    with _get_service() as service:
+        return service.get_monthly_revenue_trend(months=months)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_goal(goal, day):
+    # day is only part of the cache key, so progress is recomputed at least once a day
+    with _get_service() as service:
+        return service.calculate_revenue_goal_progress(goal)
+
+
+def clear_financial_cache():
+    """Drop cached financial data so the next run reads from the database"""
+    _cached_summary.clear()
+    _cached_revenue_by_business.clear()
+    _cached_comparison.clear()
+    _cached_trend.clear()
+    _cached_goal.clear()
+
 
 def show_unified_financials():
     """Display unified financial dashboard"""
@@ -25,12 +87,12 @@ def show_unified_financials():
     st.markdown("*Financial overview across all Bornfidis businesses*")
     st.markdown("---")
     
+    if st.sidebar.button("🔄 Refresh Financials"):
+        clear_financial_cache()
+    
     try:
-        # Initialize service
-        financial_service = UnifiedFinancialService()
-        
         # Get financial summary
-        summary = financial_service.get_financial_summary()
+        summary = _cached_summary()
     except Exception as e:
         st.error(f"❌ Error initializing financial service: {str(e)}")
         st.exception(e)
@@ -43,22 +105,22 @@ def show_unified_financials():
     with col1:
         st.metric(
             "Total Revenue",
-            f"${summary['total_revenue']:,.2f}",
+            _money(summary['total_revenue']),
             delta="All Businesses"
         )
     
     with col2:
         st.metric(
             "Total Expenses",
-            f"${summary['total_expenses']:,.2f}",
+            _money(summary['total_expenses']),
             delta=None
         )
     
     with col3:
         st.metric(
             "Net Profit",
-            f"${summary['net_profit']:,.2f}",
-            delta=f"{summary['profit_margin']:.1f}% margin"
+            _money(summary['net_profit']),
+            delta=f"{_pct(summary['profit_margin'])} margin"
         )
     
     with col4:
@@ -66,33 +128,40 @@ def show_unified_financials():
         st.metric(
             "Top Business",
             top_business['name'] if top_business['name'] else "N/A",
-            delta=f"${top_business['revenue']:,.2f}"
+            delta=_money(top_business['revenue'])
         )
     
     st.markdown("---")
     
+    revenue_data = _cached_revenue_by_business()
+    
+    # Nothing to chart yet - skip building the figures, tables and trend queries
+    if not revenue_data or summary['total_revenue'] == 0:
+        st.info("No revenue recorded yet. Add transactions in Financial Management to see charts here.")
+        return
+    
     # Revenue by Business
     st.markdown("### 🏢 Revenue by Business")
     
-    revenue_data = financial_service.get_revenue_by_business()
+    # Look up each business profile once and reuse it for every chart
+    profiles = {business_id: get_business_profile(business_id) for business_id in revenue_data}
     
-    # Create bar chart
-    businesses = []
-    revenues = []
-    colors = []
-    
-    for business_id, revenue in revenue_data.items():
-        business = get_business_profile(business_id)
-        businesses.append(business['name'])
-        revenues.append(revenue)
-        colors.append(business['primary_color'])
+    # One frame feeds both the bar chart and the pie chart
+    revenue_df = pd.DataFrame(
+        [
+            (business_id, profiles[business_id]['name'], profiles[business_id]['primary_color'], revenue)
+            for business_id, revenue in revenue_data.items()
+        ],
+        columns=['bid', 'name', 'color', 'revenue']
+    )
     
+    # Create bar chart
     fig = go.Figure(data=[
         go.Bar(
-            x=businesses,
-            y=revenues,
-            marker_color=colors,
-            text=[f"${r:,.0f}" for r in revenues],
+            x=revenue_df['name'],
+            y=revenue_df['revenue'],
+            marker_color=revenue_df['color'],
+            text=revenue_df['revenue'].map('${:,.0f}'.format),
             textposition='auto',
         )
     ])
@@ -111,14 +180,13 @@ def show_unified_financials():
     st.markdown("### 📈 Detailed Business Comparison")
     
     try:
-        comparison_data = financial_service.get_business_comparison_data()
+        comparison_data = _cached_comparison()
         
         if comparison_data:
-            import pandas as pd
             df = pd.DataFrame(comparison_data)
-            df['revenue'] = df['revenue'].apply(lambda x: f"${x:,.2f}")
-            df['profit'] = df['profit'].apply(lambda x: f"${x:,.2f}")
-            df['profit_margin'] = df['profit_margin'].apply(lambda x: f"{x:.1f}%")
+            df['revenue'] = df['revenue'].map(_money)
+            df['profit'] = df['profit'].map(_money)
+            df['profit_margin'] = df['profit_margin'].map(_pct)
             
             df.columns = ['Business', 'Revenue', 'Profit', 'Profit Margin']
             st.dataframe(df, use_container_width=True, hide_index=True)
@@ -134,17 +202,13 @@ def show_unified_financials():
         st.markdown("### 🥧 Revenue Distribution")
         
         # Filter out zero revenue businesses for cleaner pie chart
-        non_zero_revenue = {k: v for k, v in revenue_data.items() if v > 0}
+        non_zero_revenue = revenue_df[revenue_df['revenue'] > 0]
         
-        if non_zero_revenue:
-            labels = [get_business_profile(bid)['name'] for bid in non_zero_revenue.keys()]
-            values = list(non_zero_revenue.values())
-            colors_pie = [get_business_profile(bid)['primary_color'] for bid in non_zero_revenue.keys()]
-            
+        if not non_zero_revenue.empty:
             fig_pie = go.Figure(data=[go.Pie(
-                labels=labels,
-                values=values,
-                marker=dict(colors=colors_pie),
+                labels=non_zero_revenue['name'],
+                values=non_zero_revenue['revenue'],
+                marker=dict(colors=non_zero_revenue['color']),
                 hole=0.3
             )])
             
@@ -159,20 +223,20 @@ def show_unified_financials():
         # Set monthly goal (can be made dynamic later)
         monthly_goal = 17000  # Based on your projections
         
-        goal_progress = financial_service.calculate_revenue_goal_progress(monthly_goal)
+        goal_progress = _cached_goal(monthly_goal, date.today())
         
         # Progress bar
         st.metric(
             "Current Progress",
-            f"${goal_progress['current']:,.2f}",
-            delta=f"{goal_progress['progress_percent']:.1f}% of goal"
+            _money(goal_progress['current']),
+            delta=f"{_pct(goal_progress['progress_percent'])} of goal"
         )
         
-        progress_bar_value = min(goal_progress['progress_percent'] / 100, 1.0)
+        progress_bar_value = float(np.clip(goal_progress['progress_percent'] / 100, 0.0, 1.0))
         st.progress(progress_bar_value)
         
-        st.write(f"**Goal:** ${goal_progress['goal']:,.2f}")
-        st.write(f"**Remaining:** ${goal_progress['remaining']:,.2f}")
+        st.write(f"**Goal:** {_money(goal_progress['goal'])}")
+        st.write(f"**Remaining:** {_money(goal_progress['remaining'])}")
         
         if goal_progress['status'] == 'on_track':
             st.success("✅ On track to meet goal!")
@@ -184,14 +248,15 @@ def show_unified_financials():
     # Monthly Trend
     st.markdown("### 📅 Monthly Revenue Trend")
     
-    trend_data = financial_service.get_monthly_revenue_trend(months=6)
+    trend_data = _cached_trend(6)
     
     if trend_data:
-        months = [d['month'] for d in trend_data]
-        revenues = [d['revenue'] for d in trend_data]
+        months = list(map(itemgetter('month'), trend_data))
+        revenues = list(map(itemgetter('revenue'), trend_data))
         
+        # WebGL trace keeps rendering fast as the trend history grows
         fig_trend = go.Figure()
-        fig_trend.add_trace(go.Scatter(
+        fig_trend.add_trace(go.Scattergl(
             x=months,
             y=revenues,
             mode='lines+markers',
@@ -204,7 +269,8 @@ def show_unified_financials():
             title="6-Month Revenue Trend",
             xaxis_title="Month",
             yaxis_title="Revenue ($)",
-            height=400
+            height=400,
+            uirevision='fin'  # Keep zoom/pan across reruns
         )
         
         st.plotly_chart(fig_trend, use_container_width=True)
@@ -215,19 +281,9 @@ def show_unified_financials():
     st.markdown("---")
     st.markdown("### ⚡ Quick Actions")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("📊 View Detailed Reports", use_container_width=True):
-            st.info("Navigate to Financial Management for detailed reports")
-    
-    with col2:
-        if st.button("🎯 Set Revenue Goals", use_container_width=True):
-            st.info("Navigate to Strategic Planning to set goals")
-    
-    with col3:
-        if st.button("💼 Compare Businesses", use_container_width=True):
-            st.info("See comparison table above")
+    for col, (label, message) in zip(st.columns(len(_QUICK_ACTIONS)), _QUICK_ACTIONS):
+        if col.button(label, use_container_width=True):
+            col.info(message)
 
 
 if __name__ == "__main__":
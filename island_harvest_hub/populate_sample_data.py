@@ -14,6 +14,61 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.database.config import get_db
 from app.models import Customer, Farmer, Order, OrderItem, Transaction, Document, MessageTemplate
 
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
+# Sample JSON fields, serialized once at import time
+_TRIDENT_PREFS = _dumps({
+    "delivery_times": ["Monday", "Wednesday", "Friday"],
+    "preferred_products": ["organic vegetables", "fresh herbs", "exotic fruits"]
+})
+_GEEJAM_PREFS = _dumps({
+    "delivery_times": ["Tuesday", "Thursday", "Saturday"],
+    "preferred_products": ["fresh seafood", "local vegetables", "tropical fruits"]
+})
+_MOON_SAN_PREFS = _dumps({
+    "delivery_times": ["Monday", "Friday"],
+    "preferred_products": ["organic produce", "fresh herbs", "local fruits"]
+})
+_DEVON_SPECIALTIES = _dumps(["yams", "cassava", "sweet potatoes"])
+_DEVON_PICKUP = _dumps({
+    "Monday": "9:00 AM",
+    "Wednesday": "9:00 AM",
+    "Friday": "9:00 AM"
+})
+_DEVON_QUALITY = _dumps({
+    "last_inspection": "2024-03-15",
+    "rating": "A+",
+    "notes": "Excellent produce quality"
+})
+_SHANICE_SPECIALTIES = _dumps(["callaloo", "tomatoes", "peppers"])
+_SHANICE_PICKUP = _dumps({
+    "Tuesday": "10:00 AM",
+    "Thursday": "10:00 AM",
+    "Saturday": "10:00 AM"
+})
+_SHANICE_QUALITY = _dumps({
+    "last_inspection": "2024-03-14",
+    "rating": "A",
+    "notes": "Consistent quality"
+})
+_OMAR_SPECIALTIES = _dumps(["bananas", "plantains", "coconuts"])
+_OMAR_PICKUP = _dumps({
+    "Monday": "8:00 AM",
+    "Wednesday": "8:00 AM",
+    "Friday": "8:00 AM"
+})
+_OMAR_QUALITY = _dumps({
+    "last_inspection": "2024-03-13",
+    "rating": "A+",
+    "notes": "Premium quality tropical fruits"
+})
+
 def create_sample_customers(db: Session):
     """Create sample hotel and restaurant customers."""
     customers = [
@@ -23,10 +78,7 @@ def create_sample_customers(db: Session):
             phone="+1 (876) 555-0101",
             email="michael@tridentcastle.com",
             address="Port Antonio, Portland, Jamaica",
-            preferences=json.dumps({
-                "delivery_times": ["Monday", "Wednesday", "Friday"],
-                "preferred_products": ["organic vegetables", "fresh herbs", "exotic fruits"]
-            }),
+            preferences=_TRIDENT_PREFS,
             satisfaction_score=5
         ),
         Customer(
@@ -35,10 +87,7 @@ def create_sample_customers(db: Session):
             phone="+1 (876) 555-0102",
             email="sarah@geejam.com",
             address="San San, Port Antonio, Jamaica",
-            preferences=json.dumps({
-                "delivery_times": ["Tuesday", "Thursday", "Saturday"],
-                "preferred_products": ["fresh seafood", "local vegetables", "tropical fruits"]
-            }),
+            preferences=_GEEJAM_PREFS,
             satisfaction_score=4
         ),
         Customer(
@@ -47,17 +96,12 @@ def create_sample_customers(db: Session):
             phone="+1 (876) 555-0103",
             email="david@moonsanvilla.com",
             address="Port Antonio, Portland, Jamaica",
-            preferences=json.dumps({
-                "delivery_times": ["Monday", "Friday"],
-                "preferred_products": ["organic produce", "fresh herbs", "local fruits"]
-            }),
+            preferences=_MOON_SAN_PREFS,
             satisfaction_score=5
         )
     ]
     
-    for customer in customers:
-        db.add(customer)
-    db.commit()
+    db.bulk_save_objects(customers, return_defaults=True)
     return customers
 
 def create_sample_farmers(db: Session):
@@ -69,17 +113,9 @@ def create_sample_farmers(db: Session):
             phone="+1 (876) 555-0201",
             email="devon@brownfarm.com",
             address="St. Mary, Jamaica",
-            product_specialties=json.dumps(["yams", "cassava", "sweet potatoes"]),
-            pickup_schedule=json.dumps({
-                "Monday": "9:00 AM",
-                "Wednesday": "9:00 AM",
-                "Friday": "9:00 AM"
-            }),
-            quality_records=json.dumps({
-                "last_inspection": "2024-03-15",
-                "rating": "A+",
-                "notes": "Excellent produce quality"
-            })
+            product_specialties=_DEVON_SPECIALTIES,
+            pickup_schedule=_DEVON_PICKUP,
+            quality_records=_DEVON_QUALITY
         ),
         Farmer(
             name="Shanice Grant",
@@ -87,17 +123,9 @@ def create_sample_farmers(db: Session):
             phone="+1 (876) 555-0202",
             email="shanice@grantfarm.com",
             address="Portland, Jamaica",
-            product_specialties=json.dumps(["callaloo", "tomatoes", "peppers"]),
-            pickup_schedule=json.dumps({
-                "Tuesday": "10:00 AM",
-                "Thursday": "10:00 AM",
-                "Saturday": "10:00 AM"
-            }),
-            quality_records=json.dumps({
-                "last_inspection": "2024-03-14",
-                "rating": "A",
-                "notes": "Consistent quality"
-            })
+            product_specialties=_SHANICE_SPECIALTIES,
+            pickup_schedule=_SHANICE_PICKUP,
+            quality_records=_SHANICE_QUALITY
         ),
         Farmer(
             name="Omar Williams",
@@ -105,31 +133,19 @@ def create_sample_farmers(db: Session):
             phone="+1 (876) 555-0203",
             email="omar@williamsfarm.com",
             address="St. Thomas, Jamaica",
-            product_specialties=json.dumps(["bananas", "plantains", "coconuts"]),
-            pickup_schedule=json.dumps({
-                "Monday": "8:00 AM",
-                "Wednesday": "8:00 AM",
-                "Friday": "8:00 AM"
-            }),
-            quality_records=json.dumps({
-                "last_inspection": "2024-03-13",
-                "rating": "A+",
-                "notes": "Premium quality tropical fruits"
-            })
+            product_specialties=_OMAR_SPECIALTIES,
+            pickup_schedule=_OMAR_PICKUP,
+            quality_records=_OMAR_QUALITY
         )
     ]
     
-    for farmer in farmers:
-        db.add(farmer)
-    db.commit()
+    db.bulk_save_objects(farmers)
     return farmers
 
 def create_sample_orders(db: Session, customers):
     """Create sample orders for customers."""
-    orders = []
-    for customer in customers:
-        # Create a recent order
-        order = Order(
+    orders = [
+        Order(
             customer_id=customer.id,
             order_date=datetime.now() - timedelta(days=2),
             delivery_date=datetime.now() + timedelta(days=1),
@@ -137,11 +153,15 @@ def create_sample_orders(db: Session, customers):
             total_amount=1500.00,
             notes=f"Regular weekly order for {customer.name}"
         )
-        db.add(order)
-        db.flush()  # Get the order ID
-        
-        # Add order items
-        items = [
+        for customer in customers
+    ]
+    db.bulk_save_objects(orders, return_defaults=True)  # Get the order IDs
+    
+    # Add order items
+    items = [
+        item
+        for order in orders
+        for item in (
             OrderItem(
                 order_id=order.id,
                 product_name="Organic Vegetables Bundle",
@@ -156,20 +176,15 @@ def create_sample_orders(db: Session, customers):
                 unit_price=250.00,
                 subtotal=500.00
             )
-        ]
-        for item in items:
-            db.add(item)
-        
-        orders.append(order)
-    
-    db.commit()
+        )
+    ]
+    db.bulk_save_objects(items)
     return orders
 
 def create_sample_transactions(db: Session, orders):
     """Create sample transactions for orders."""
-    transactions = []
-    for order in orders:
-        transaction = Transaction(
+    transactions = [
+        Transaction(
             date=datetime.now() - timedelta(days=1),
             type="Revenue",
             description=f"Payment for Order #{order.id}",
@@ -177,10 +192,9 @@ def create_sample_transactions(db: Session, orders):
             related_entity_id=order.id,
             related_entity_type="Order"
         )
-        db.add(transaction)
-        transactions.append(transaction)
-    
-    db.commit()
+        for order in orders
+    ]
+    db.bulk_save_objects(transactions)
     return transactions
 
 def create_sample_message_templates(db: Session):
@@ -189,26 +203,24 @@ def create_sample_message_templates(db: Session):
         MessageTemplate(
             name="Order Confirmation",
             type="WhatsApp",
-            title="Order Confirmation",
+            subject="Order Confirmation",
             body="Dear {customer_name},\n\nYour order #{order_id} has been confirmed for delivery on {delivery_date}.\n\nTotal amount: ${total_amount}\n\nThank you for choosing Island Harvest Hub!"
         ),
         MessageTemplate(
             name="Delivery Reminder",
             type="WhatsApp",
-            title="Delivery Reminder",
+            subject="Delivery Reminder",
             body="Dear {customer_name},\n\nThis is a reminder that your order #{order_id} will be delivered tomorrow at {delivery_time}.\n\nPlease ensure someone is available to receive the delivery.\n\nThank you!"
         ),
         MessageTemplate(
             name="Payment Reminder",
             type="WhatsApp",
-            title="Payment Reminder",
+            subject="Payment Reminder",
             body="Dear {customer_name},\n\nThis is a friendly reminder that payment for order #{order_id} is due on {due_date}.\n\nAmount due: ${amount}\n\nThank you for your prompt attention to this matter."
         )
     ]
     
-    for template in templates:
-        db.add(template)
-    db.commit()
+    db.bulk_save_objects(templates)
     return templates
 
 def create_sample_documents(db: Session):
@@ -234,9 +246,7 @@ def create_sample_documents(db: Session):
         )
     ]
     
-    for document in documents:
-        db.add(document)
-    db.commit()
+    db.bulk_save_objects(documents)
     return documents
 
 def main():
@@ -254,6 +264,9 @@ def main():
         message_templates = create_sample_message_templates(db)
         documents = create_sample_documents(db)
         
+        # Everything above is one transaction, committed once
+        db.commit()
+        
         print("Sample data population complete!")
         print(f"Created {len(customers)} customers")
         print(f"Created {len(farmers)} farmers")
@@ -9,10 +9,13 @@ from pathlib import Path
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.database.config import DATABASE_PATH, DATABASE_URL, SQLALCHEMY_DATABASE_URI
+from app.database.config import engine, DATABASE_PATH, DATABASE_URL, SQLALCHEMY_DATABASE_URI
 from app.database.manager import DatabaseManager
-from app.database.schema import SchemaVerifier
-from app.database.migrations.runner import MigrationRunner
+
+# Shared across all tests - the manager owns a schema verifier (with its inspector)
+# and a migration runner, so connection setup and reflection happen once
+ENGINE = engine
+MANAGER = DatabaseManager(ENGINE)
 
 def test_database_config():
     """Test database configuration."""
@@ -26,13 +29,12 @@ def test_database_config():
     print(f"Path is absolute: {DATABASE_PATH.is_absolute()}")
     print("✅ Configuration test passed\n")
 
-def test_database_manager():
+def test_database_manager(manager=MANAGER):
     """Test database manager."""
     print("=" * 80)
     print("TEST: Database Manager")
     print("=" * 80)
     
-    manager = DatabaseManager()
     status = manager.get_status()
     
     print(f"Database exists: {status['database']['exists']}")
@@ -41,15 +43,12 @@ def test_database_manager():
     print(f"Schema valid: {status['schema']['valid']}")
     print("✅ Manager test passed\n")
 
-def test_schema_verifier():
+def test_schema_verifier(verifier=MANAGER.verifier):
     """Test schema verifier."""
     print("=" * 80)
     print("TEST: Schema Verifier")
     print("=" * 80)
     
-    from app.database.config import engine
-    verifier = SchemaVerifier(engine, DATABASE_PATH)
-    
     info = verifier.get_database_info()
     print(f"Database exists: {info['exists']}")
     print(f"Total tables: {len(info['tables'])}")
@@ -61,15 +60,12 @@ def test_schema_verifier():
     
     print("✅ Schema verifier test passed\n")
 
-def test_migration_runner():
+def test_migration_runner(runner=MANAGER.migration_runner):
     """Test migration runner."""
     print("=" * 80)
     print("TEST: Migration Runner")
     print("=" * 80)
     
-    from app.database.config import engine
-    runner = MigrationRunner(engine)
-    
     applied = runner.get_applied_migrations()
     print(f"Applied migrations: {len(applied)}")
     if applied:
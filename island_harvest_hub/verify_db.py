@@ -25,72 +25,94 @@ from app.models import (
     PerformanceMetric, Partnership
 )
 
-def get_table_row_count(engine, table_name):
+def get_table_row_count(conn, table_name, allowed_tables):
     """Get row count for a table."""
+    # Table names can't be bound parameters, so only interpolate names that exist in the database
+    if table_name not in allowed_tables:
+        return f"Error: no such table: {table_name}"
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-            return result.scalar()
+        result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
+        return result.scalar()
     except Exception as e:
+        conn.rollback()
         return f"Error: {str(e)}"
 
+def get_row_counts(conn, table_names):
+    """Get row counts for several tables with a single UNION ALL query."""
+    sql = " UNION ALL ".join(
+        f"SELECT '{table_name}' AS name, COUNT(*) AS n FROM {table_name}"
+        for table_name in table_names
+    )
+    return dict(conn.execute(text(sql)).fetchall())
+
 def print_schema():
     """Print database schema information."""
-    print("=" * 80)
-    print("DATABASE SCHEMA VERIFICATION")
-    print("=" * 80)
-    print(f"\nDatabase Path: {DATABASE_PATH}")
-    print(f"Database Exists: {DATABASE_PATH.exists()}")
-    print(f"Database Size: {DATABASE_PATH.stat().st_size / 1024:.2f} KB" if DATABASE_PATH.exists() else "N/A")
-    print("\n" + "=" * 80)
+    # Collect lines and write them once - each print flushes on the Windows console wrapper
+    out = []
+    out.append("=" * 80)
+    out.append("DATABASE SCHEMA VERIFICATION")
+    out.append("=" * 80)
+    out.append(f"\nDatabase Path: {DATABASE_PATH}")
+    out.append(f"Database Exists: {DATABASE_PATH.exists()}")
+    out.append(f"Database Size: {DATABASE_PATH.stat().st_size / 1024:.2f} KB" if DATABASE_PATH.exists() else "N/A")
+    out.append("\n" + "=" * 80)
     
     # Get inspector
     inspector = inspect(engine)
     tables = inspector.get_table_names()
     
-    print(f"\nTotal Tables: {len(tables)}")
-    print("\n" + "-" * 80)
-    print("TABLE SCHEMA")
-    print("-" * 80)
+    # Reflect metadata for all tables up front, keyed by (schema, table_name)
+    columns_by_table = inspector.get_multi_columns()
+    pk_by_table = inspector.get_multi_pk_constraint()
+    fks_by_table = inspector.get_multi_foreign_keys()
+    indexes_by_table = inspector.get_multi_indexes()
+    
+    out.append(f"\nTotal Tables: {len(tables)}")
+    out.append("\n" + "-" * 80)
+    out.append("TABLE SCHEMA")
+    out.append("-" * 80)
     
     for table_name in sorted(tables):
-        print(f"\n[Table] {table_name}")
-        print("-" * 40)
+        out.append(f"\n[Table] {table_name}")
+        out.append("-" * 40)
         
         # Get columns
-        columns = inspector.get_columns(table_name)
-        print("Columns:")
+        columns = columns_by_table[(None, table_name)]
+        out.append("Columns:")
         for col in columns:
             col_type = str(col['type'])
             nullable = "NULL" if col['nullable'] else "NOT NULL"
             default = f" DEFAULT {col['default']}" if col.get('default') is not None else ""
-            print(f"  - {col['name']}: {col_type} {nullable}{default}")
+            out.append(f"  - {col['name']}: {col_type} {nullable}{default}")
         
         # Get primary keys
-        pk_constraint = inspector.get_pk_constraint(table_name)
+        pk_constraint = pk_by_table[(None, table_name)]
         if pk_constraint['constrained_columns']:
-            print(f"Primary Key: {', '.join(pk_constraint['constrained_columns'])}")
+            out.append(f"Primary Key: {', '.join(pk_constraint['constrained_columns'])}")
         
         # Get foreign keys
-        fk_constraints = inspector.get_foreign_keys(table_name)
+        fk_constraints = fks_by_table[(None, table_name)]
         if fk_constraints:
-            print("Foreign Keys:")
+            out.append("Foreign Keys:")
             for fk in fk_constraints:
-                print(f"  - {', '.join(fk['constrained_columns'])} -> {fk['referred_table']}.{', '.join(fk['referred_columns'])}")
+                out.append(f"  - {', '.join(fk['constrained_columns'])} -> {fk['referred_table']}.{', '.join(fk['referred_columns'])}")
         
         # Get indexes
-        indexes = inspector.get_indexes(table_name)
+        indexes = indexes_by_table[(None, table_name)]
         if indexes:
-            print("Indexes:")
+            out.append("Indexes:")
             for idx in indexes:
                 unique = "UNIQUE " if idx['unique'] else ""
-                print(f"  - {unique}{idx['name']}: {', '.join(idx['column_names'])}")
+                out.append(f"  - {unique}{idx['name']}: {', '.join(idx['column_names'])}")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 def print_row_counts():
     """Print row counts for all tables."""
-    print("\n" + "=" * 80)
-    print("ROW COUNTS")
-    print("=" * 80)
+    out = []
+    out.append("\n" + "=" * 80)
+    out.append("ROW COUNTS")
+    out.append("=" * 80)
     
     # Define all tables
     tables = [
@@ -111,32 +133,51 @@ def print_row_counts():
         ('partnerships', Partnership),
     ]
     
-    print(f"\n{'Table Name':<30} {'Row Count':<15} {'Status'}")
-    print("-" * 80)
+    out.append(f"\n{'Table Name':<30} {'Row Count':<15} {'Status'}")
+    out.append("-" * 80)
+    
+    allowed_tables = set(inspect(engine).get_table_names())
+    existing_tables = [table_name for table_name, _ in tables if table_name in allowed_tables]
+    
+    with engine.connect() as conn:
+        counts = {}
+        if existing_tables:
+            try:
+                counts = get_row_counts(conn, existing_tables)
+            except Exception:
+                # One bad table fails the whole query - count individually so each error is reported
+                conn.rollback()
+        
+        for table_name, _ in tables:
+            if table_name not in counts:
+                counts[table_name] = get_table_row_count(conn, table_name, allowed_tables)
     
     total_rows = 0
     for table_name, model in tables:
         try:
-            count = get_table_row_count(engine, table_name)
+            count = counts[table_name]
             if isinstance(count, int):
                 total_rows += count
                 status = "[OK]"
             else:
                 status = "[ERROR]"
                 count = str(count)
-            print(f"{table_name:<30} {str(count):<15} {status}")
+            out.append(f"{table_name:<30} {str(count):<15} {status}")
         except Exception as e:
-            print(f"{table_name:<30} {'Error':<15} [ERROR] {str(e)}")
+            out.append(f"{table_name:<30} {'Error':<15} [ERROR] {str(e)}")
     
-    print("-" * 80)
-    print(f"{'TOTAL':<30} {str(total_rows):<15} [OK]")
-    print("=" * 80)
+    out.append("-" * 80)
+    out.append(f"{'TOTAL':<30} {str(total_rows):<15} [OK]")
+    out.append("=" * 80)
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 def check_business_id_column():
     """Check if business_id column exists in customers table."""
-    print("\n" + "=" * 80)
-    print("BUSINESS_ID COLUMN CHECK")
-    print("=" * 80)
+    out = []
+    out.append("\n" + "=" * 80)
+    out.append("BUSINESS_ID COLUMN CHECK")
+    out.append("=" * 80)
     
     inspector = inspect(engine)
     
@@ -145,8 +186,8 @@ def check_business_id_column():
         columns = [col['name'] for col in inspector.get_columns('customers')]
         has_business_id = 'business_id' in columns
         
-        print(f"\nCustomers table:")
-        print(f"  - business_id column exists: {'[YES]' if has_business_id else '[NO]'}")
+        out.append(f"\nCustomers table:")
+        out.append(f"  - business_id column exists: {'[YES]' if has_business_id else '[NO]'}")
         
         if has_business_id:
             # Check if any rows are missing business_id
@@ -155,15 +196,17 @@ def check_business_id_column():
                     result = conn.execute(text("SELECT COUNT(*) FROM customers WHERE business_id IS NULL OR business_id = ''"))
                     null_count = result.scalar()
                     if null_count > 0:
-                        print(f"  - Rows with missing business_id: {null_count} [WARNING]")
+                        out.append(f"  - Rows with missing business_id: {null_count} [WARNING]")
                     else:
-                        print(f"  - All rows have business_id: [OK]")
+                        out.append(f"  - All rows have business_id: [OK]")
             except Exception as e:
-                print(f"  - Error checking data: {str(e)}")
+                out.append(f"  - Error checking data: {str(e)}")
         else:
-            print("  [WARNING] Migration needed: customers.business_id column is missing!")
+            out.append("  [WARNING] Migration needed: customers.business_id column is missing!")
     else:
-        print("  [ERROR] Customers table does not exist!")
+        out.append("  [ERROR] Customers table does not exist!")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     try:
@@ -4,6 +4,7 @@ Setup script for Island Harvest Hub AI Assistant.
 
 import os
 import sys
+import shutil
 import subprocess
 import venv
 from pathlib import Path
@@ -18,10 +19,19 @@ def install_dependencies():
     print("Installing dependencies...")
     if sys.platform == "win32":
         pip_path = "venv\\Scripts\\pip"
+        python_path = "venv\\Scripts\\python"
     else:
         pip_path = "venv/bin/pip"
+        python_path = "venv/bin/python"
     
-    subprocess.run([pip_path, "install", "-r", "island_harvest_hub/requirements.txt"])
+    # uv resolves and installs wheels in parallel - use it when available
+    uv_path = shutil.which("uv")
+    if uv_path:
+        subprocess.run([uv_path, "pip", "install", "--python", python_path,
+                        "-r", "island_harvest_hub/requirements.txt"])
+    else:
+        subprocess.run([python_path, "-m", "pip", "install", "--upgrade", "pip", "wheel"])
+        subprocess.run([pip_path, "install", "-r", "island_harvest_hub/requirements.txt"])
 
 def create_directories():
     """Create necessary directories."""
@@ -35,7 +45,12 @@ def create_directories():
         "island_harvest_hub/documents/backups"
     ]
     
-    for directory in directories:
+    # mkdir(parents=True) creates the parents too, so only the leaf directories need a call
+    leaf_directories = [
+        directory for directory in directories
+        if not any(other.startswith(directory + "/") for other in directories)
+    ]
+    for directory in leaf_directories:
         Path(directory).mkdir(parents=True, exist_ok=True)
 
 def initialize_database():